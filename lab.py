@@ -1,4 +1,20 @@
+import functools
+import os
+import sys
+from typing import Any, Callable, Optional
 
+# PyPy's JIT already compiles the interpreter, and C extensions only slow it
+# down, so the numba kernels and lab_fast tokenizer are left out there
+_PYPY = sys.implementation.name == "pypy"
+
+try:
+    if _PYPY:
+        raise ImportError
+    # numba is optional and untyped, so mypy/mypyc don't need to find it
+    import numba  # type: ignore[import-not-found, import-untyped]
+    from numba.core.errors import NumbaError  # type: ignore[import-not-found, import-untyped]
+except ImportError:
+    numba = None  # type: ignore[assignment]
 
 
 class SchemeError(Exception):
@@ -41,6 +57,16 @@ class SchemeEvaluationError(SchemeError):
 ############################
 
 
+# characters that a symbol token can start with but a number token can't;
+# int and float also accept leading whitespace (a tab or a carriage return
+# stays in a token) and non-ASCII digits, so those aren't in here
+_SYMBOL_START = frozenset(
+    char
+    for char in map(chr, range(128))
+    if not char.isspace() and char not in "0123456789+-."
+)
+
+
 def number_or_symbol(value):
     """
     Helper function: given a string, convert it to an integer or a float if
@@ -55,16 +81,44 @@ def number_or_symbol(value):
     >>> number_or_symbol('x')
     'x'
     """
+    # most tokens are symbols, so skip the int/float attempts when the first
+    # character can't start a number
+    if value[:1] in _SYMBOL_START:
+        return sys.intern(value)
     try:
         return int(value)
     except ValueError:
         try:
             return float(value)
         except ValueError:
-            return value
+            return sys.intern(value)
+
+
+# character classes for tokenize; anything with the low bit set carries on a
+# symbol or number token (a semicolon only starts a comment at the start of a
+# token)
+_WHITESPACE = 0
+_SYMBOL = 1
+_PAREN = 2
+_SEMICOLON = 3
+
+
+def _classify(code):
+    char = chr(code)
+    if char in " \n":
+        return _WHITESPACE
+    if char in "()":
+        return _PAREN
+    if char == ";":
+        return _SEMICOLON
+    return _SYMBOL
 
 
-def tokenize(source):
+# byte -> its character class, for bytes.translate
+_CHAR_CLASSES = bytes(_classify(code) for code in range(256))
+
+
+def tokenize(source: str) -> list[str]:
     """
     Splits an input string into meaningful tokens (left parens, right parens,
     other whitespace-separated values).  Returns a list of strings.
@@ -73,43 +127,44 @@ def tokenize(source):
         source (str): a string containing the source code of a Scheme
                       expression
     """
-    # we took out all the spacee
+    # classify every character up front, so the loops below only compare
+    # small ints; non-ASCII characters become "?", one byte each, so indexes
+    # still line up with source
+    classes = source.encode("ascii", "replace").translate(_CHAR_CLASSES)
     i = 0
+    n = len(classes)
     tokens = []
-    while i < len(source):
-        # print(i, source[i])
-        if source[i] == ";":
-            # once we hit a semicolon keep stepping until we find a line break
-            while i < len(source) and source[i] != "\n":
-                # print(source[i], "FHAIEO")
-                i += 1
-            if i >= len(source):
-                break
-            else:
-                continue
-        if source[i] == "(":
-            tokens.append(source[i])
-            i += 1
-            continue
-        if source[i] == ")":
-            tokens.append(source[i])
-            i += 1
-            continue
-        if source[i] == "\n":
-            i += 1
-            continue
-        if source[i] != " ":
+    while i < n:
+        char_class = classes[i]
+        if char_class == _SYMBOL:
             start_index = i
+            i += 1
             # once we hit a non parenthesis keep stepping till we hit a space
-            while i < len(source) and source[i] not in " (  ) \n":
+            while i < n and classes[i] & 1:
                 i += 1
             tokens.append(source[start_index:i])
-            continue
-        i += 1
+        elif char_class == _WHITESPACE:
+            i += 1
+        elif char_class == _PAREN:
+            tokens.append(source[i])
+            i += 1
+        else:
+            # once we hit a semicolon skip ahead to the next line break
+            i = source.find("\n", i)
+            if i == -1:
+                break
     return tokens
 
 
-def parse(tokens):
+if not _PYPY:
+    try:
+        # use the compiled tokenizer from lab_fast.pyx if it has been built
+        from lab_fast import tokenize  # type: ignore
+    except ImportError:
+        pass
+
+
+def parse(tokens: list[str]) -> Any:
     """
     Parses a list of tokens, constructing a representation where:
         * symbols are represented as Python strings
@@ -120,29 +175,25 @@ def parse(tokens):
         tokens (list): a list of strings representing tokens
     """
 
-    def parse_expression(index):
-        if tokens[index] == ")":
-            raise SchemeSyntaxError
-        if tokens[index] == "(":
-            index += 1
-            subexpression = []
-            try:
-                while tokens[index] != ")":
-                    if len(tokens) - 1 == index:
-                        raise SchemeSyntaxError
-                    next_val, index = parse_expression(index)
-                    subexpression.append(next_val)
-                return subexpression, (index + 1)
-            except IndexError:
+    # stack of the S-expressions that are still open, innermost last
+    stack: list[list] = [[]]
+    for token in tokens:
+        if token == "(":
+            subexpression: list = []
+            stack[-1].append(subexpression)
+            stack.append(subexpression)
+        elif token == ")":
+            # a close paren with nothing open to close
+            if len(stack) == 1:
                 raise SchemeSyntaxError
+            stack.pop()
         else:
-            return number_or_symbol(tokens[index]), index + 1
+            stack[-1].append(number_or_symbol(token))
 
-    answer, index = parse_expression(0)
-    if len(tokens) != index:
+    # error check, every paren got closed and there was exactly one expression
+    if len(stack) != 1 or len(stack[0]) != 1:
         raise SchemeSyntaxError
-    return answer
-    # error check, if you don't get to the end of the expression
+    return stack[0][0]
 
 
 ######################
@@ -169,7 +220,230 @@ def division(divisers):
 ##############
 
 
-def evaluate(tree, frame=None):
+# opcodes for the compiled form of a syntax tree; every compiled node is a
+# tuple whose first element is one of these
+OP_CONST = 0  # (OP_CONST, value)
+OP_LOCAL = 1  # (OP_LOCAL, depth, slot, fallback)
+OP_GLOBAL = 2  # (OP_GLOBAL, name, depth)
+OP_CALL = 3  # (OP_CALL, callee, (arg, ...))
+OP_IF = 4  # (OP_IF, condition, then, else)
+OP_DEFINE = 5  # (OP_DEFINE, name, value)
+OP_LAMBDA = 6  # (OP_LAMBDA, paramaters, body, names, extra_slots, kernel, factory)
+OP_AND = 7  # (OP_AND, (sub_tree, ...))
+OP_OR = 8  # (OP_OR, (sub_tree, ...))
+OP_DEL = 9  # (OP_DEL, name)
+OP_LET = 10  # (OP_LET, names, ((slot, value), ...), body)
+OP_SET = 11  # (OP_SET, name, value)
+
+
+def compile_tree(tree, scopes=()):
+    """
+    Compile a parsed syntax tree into nested opcode tuples, so special forms
+    are recognized once here rather than every time the code is evaluated.
+
+    Names bound by a lambda or let are resolved here to a (depth, slot) pair
+    in a LocalFrame; only names from outside of every lambda and let are
+    looked up by name at run time.
+
+    Code that can't be compiled properly (an empty list, a special form with
+    missing parts) is only an error if it gets evaluated:
+
+    >>> evaluate(parse(tokenize("(if #t 1 ())")))
+    1
+    >>> evaluate(parse(tokenize("(and #f ())")))
+    False
+    >>> evaluate(parse(tokenize("(or #t (let ((a)) a))")))
+    True
+    >>> evaluate(parse(tokenize("(if #t 1 (lambda))")))
+    1
+    >>> frame = Frame()
+    >>> _ = evaluate(parse(tokenize("(define (h) (if #f (define) 2))")), frame)
+    >>> evaluate(parse(tokenize("(h)")), frame)
+    2
+    >>> _ = evaluate(parse(tokenize("(define (g) ())")), frame)
+    >>> evaluate(parse(tokenize("(g)")), frame)
+    Traceback (most recent call last):
+    ...
+    lab.SchemeEvaluationError: cannot evaluate an empty expression
+    >>> evaluate(parse(tokenize("(let ((a)) a)")))
+    Traceback (most recent call last):
+    ...
+    lab.SchemeSyntaxError: malformed let
+
+    Arguments:
+        tree (type varies): a fully parsed expression, as the output from the
+                            parse function
+        scopes (tuple): for each enclosing lambda or let, innermost last, a
+                        dict mapping the names it binds to their slots
+    """
+    if isinstance(tree, (float, int)):
+        return (OP_CONST, tree)
+
+    elif isinstance(tree, str):
+        return _compile_name(tree, scopes)
+    if len(tree) == 0:
+        return _EMPTY_EXPRESSION
+
+    # special forms are looked up by name, anything else is a function call
+    head = tree[0]
+    if isinstance(head, str):
+        special_form = _SPECIAL.get(head)
+        if special_form is not None:
+            try:
+                return special_form(tree, scopes)
+            except (IndexError, TypeError):
+                # missing or misshapen parts; like anything else that's
+                # wrong, only an error if the form actually gets evaluated
+                return _error_node(SchemeSyntaxError, f"malformed {head}")
+
+    return (
+        OP_CALL,
+        compile_tree(head, scopes),
+        tuple(compile_tree(element, scopes) for element in tree[1:]),
+    )
+
+
+def _compile_name(name, scopes):
+    # a slot can still be unbound when it's read (used before its define, or
+    # after a del), in which case the lookup carries on outwards like it
+    # would have by name, so build the chain from the outermost scope in
+    node = (OP_GLOBAL, name, len(scopes))
+    for depth in range(len(scopes) - 1, -1, -1):
+        slot = scopes[-1 - depth].get(name)
+        if slot is not None:
+            node = (OP_LOCAL, depth, slot, node)
+    return node
+
+
+def _defined_names(tree, names):
+    """
+    Add to names every name that tree defines in the frame it is evaluated in
+    (so not counting defines inside of a nested lambda or let).
+    """
+    if not isinstance(tree, list) or len(tree) == 0:
+        return
+    head = tree[0]
+    if head == "define":
+        if len(tree) < 3 or tree[1] == []:
+            # malformed, compile_tree leaves it to fail if it's evaluated
+            return
+        if isinstance(tree[1], list):
+            # short form, the body is a lambda of its own
+            if not isinstance(tree[1][0], list):
+                names.append(tree[1][0])
+            return
+        names.append(tree[1])
+    elif head == "lambda" or head == "let":
+        return
+    for sub_tree in tree:
+        _defined_names(sub_tree, names)
+
+
+def _compile_define(tree, scopes):
+    if isinstance(tree[1], list):
+        # ['define', 'add2', ['lambda', ['x', 'y'], ['+', 'x', 'y']]]
+        # ['define', ['add2', 'x', 'y'], ['+', 'x', 'y']]
+        new_list = ["lambda"] + [tree[1][1:]]
+        new_list.append(tree[2])
+        new_tree = [tree[0], tree[1][0], new_list]
+
+        return compile_tree(new_tree, scopes)
+    return (OP_DEFINE, tree[1], compile_tree(tree[2], scopes))
+
+
+def _compile_lambda(tree, scopes):
+    paramaters = tree[1]
+    names = {var: slot for slot, var in enumerate(paramaters)}
+    # names defined in the body get slots after the paramaters
+    defined = []
+    _defined_names(tree[2], defined)
+    extra_slots = 0
+    for var in defined:
+        if var not in names:
+            names[var] = len(paramaters) + extra_slots
+            extra_slots += 1
+    body = compile_tree(tree[2], scopes + (names,))
+    kernel = _numeric_kernel(paramaters, tree[2], scopes)
+    factory = _python_factory(paramaters, tree[2], scopes)
+    return (OP_LAMBDA, paramaters, body, names, extra_slots, kernel, factory)
+
+
+def _compile_if(tree, scopes):
+    # a missing branch is only an error if it gets taken
+    branches = [
+        compile_tree(tree[index], scopes) if index < len(tree) else _MISSING_BRANCH
+        for index in (2, 3)
+    ]
+    return (OP_IF, compile_tree(tree[1], scopes), *branches)
+
+
+def _error_node(error, message):
+    """
+    Compiled code that raises error(message) when it's executed, for code
+    that can't be compiled properly but might never run.
+    """
+
+    def raise_error(args):
+        raise error(message)
+
+    return (OP_CALL, (OP_CONST, raise_error), ())
+
+
+_MISSING_BRANCH = _error_node(SchemeEvaluationError, "if is missing a branch")
+_EMPTY_EXPRESSION = _error_node(
+    SchemeEvaluationError, "cannot evaluate an empty expression"
+)
+
+
+def _compile_and(tree, scopes):
+    return (OP_AND, tuple(compile_tree(sub_tree, scopes) for sub_tree in tree[1:]))
+
+
+def _compile_or(tree, scopes):
+    return (OP_OR, tuple(compile_tree(sub_tree, scopes) for sub_tree in tree[1:]))
+
+
+def _compile_del(tree, scopes):
+    return (OP_DEL, tree[1])
+
+
+def _compile_let(tree, scopes):
+    names = {}
+    defined = []
+    for sub_tree in tree[1]:
+        names.setdefault(sub_tree[0], len(names))
+        _defined_names(sub_tree[1], defined)
+    _defined_names(tree[2], defined)
+    for var in defined:
+        names.setdefault(var, len(names))
+
+    # the values are evaluated in the new frame, same as the body
+    inner_scopes = scopes + (names,)
+    bindings = tuple(
+        (names[sub_tree[0]], compile_tree(sub_tree[1], inner_scopes))
+        for sub_tree in tree[1]
+    )
+    return (OP_LET, names, bindings, compile_tree(tree[2], inner_scopes))
+
+
+def _compile_set(tree, scopes):
+    return (OP_SET, tree[1], compile_tree(tree[2], scopes))
+
+
+# special form name -> function that compiles that form
+_SPECIAL = {
+    "define": _compile_define,
+    "lambda": _compile_lambda,
+    "if": _compile_if,
+    "and": _compile_and,
+    "or": _compile_or,
+    "del": _compile_del,
+    "let": _compile_let,
+    "set!": _compile_set,
+}
+
+
+def evaluate(tree: Any, frame: Optional["Frame"] = None) -> Any:
     """
     Evaluate the given syntax tree according to the rules of the Scheme
     language.
@@ -183,71 +457,388 @@ def evaluate(tree, frame=None):
     if frame is None:
         frame = Frame()
 
+    return execute(compile_tree(tree), frame)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_source(source):
+    """
+    Tokenize, parse and compile a string of Scheme source.  The result only
+    depends on the string, so it's cached and running the same source again
+    goes straight to execute.
+
+    Arguments:
+        source (str): a string containing the source code of a Scheme
+                      expression
+    """
+    return compile_tree(parse(tokenize(source)))
+
+
+def execute(node, frame):
+    """
+    Evaluate a compiled node (the output of compile_tree) in the given frame.
+
+    Whatever node this loop is on is in tail position, so instead of
+    recursing on the branch of an if, the body of a let or the body of a
+    called Function, it carries on the loop with that node and frame; tail
+    recursive Scheme functions then run in constant Python stack.
+    """
+    while True:
+        op = node[0]
+        if op == OP_LOCAL:
+            depth = node[1]
+            local_frame = frame
+            while depth:
+                local_frame = local_frame.parent_frame
+                depth -= 1
+            val = local_frame.slots[node[2]]
+            if val is not _MISS:
+                return val
+            node = node[3]
+
+        elif op == OP_CONST:
+            return node[1]
+
+        elif op == OP_GLOBAL:
+            depth = node[2]
+            while depth:
+                frame = frame.parent_frame
+                depth -= 1
+            return frame[node[1]]
+
+        elif op == OP_CALL:
+            function = execute(node[1], frame)
+            args = [execute(arg, frame) for arg in node[2]]
+
+            # same as Function.__call__, except that an interpreted body is
+            # run by this loop rather than a new call to execute
+            while isinstance(function, Function):
+                if function.arity != len(args):
+                    function.wrong_args(args)
+                if function.kernel is not None:
+                    result = function.run_kernel(args)
+                    if result is not _MISS:
+                        return result
+                if function.fast is None:
+                    # args was built just for this call, so it can become the
+                    # new frame's slots as it is rather than being copied
+                    if function.padding:
+                        args.extend(function.padding)
+                    frame = _new_frame(LocalFrame)
+                    frame.parent_frame = function.frame
+                    frame.names = function.names
+                    frame.slots = args
+                    node = function.code
+                    break
+                result = function.fast(*args)
+                if not isinstance(result, _TailCall):
+                    return result
+                function, args = result.function, result.args
+            else:
+                if not callable(function):
+                    raise SchemeEvaluationError(f"Not callable: {function}")
+                return function(args)
+
+        elif op == OP_IF:
+            if execute(node[1], frame) == True:
+                node = node[2]
+            else:
+                node = node[3]
+
+        elif op == OP_DEFINE:
+            result = execute(node[2], frame)
+            frame[node[1]] = result
+            return result
+
+        elif op == OP_LAMBDA:
+            return Function(frame, *node[1:])
+
+        elif op == OP_AND:
+            for sub_tree in node[1]:
+                if not execute(sub_tree, frame):
+                    return False
+            return True
+
+        elif op == OP_OR:
+            for sub_tree in node[1]:
+                if execute(sub_tree, frame):
+                    return True
+            return False
+
+        elif op == OP_DEL:
+            frame[node[1]]
+            return frame.delete(node[1])
+
+        elif op == OP_LET:
+            names = node[1]
+            baby_frame = LocalFrame(frame, names, [_MISS] * len(names))
+            for slot, value in node[2]:
+                baby_frame.slots[slot] = execute(value, baby_frame)
+            node = node[3]
+            frame = baby_frame
+
+        elif op == OP_SET:
+            frame[node[1]]
+            temp = execute(node[2], frame)
+            frame.set_exisits(node[1], temp)
+            return temp
+
+
+###################
+# Numeric Kernels #
+###################
+
+
+# builtins that a numeric kernel can inline
+_KERNEL_OPS = frozenset(["+", "-", "*", "/", ">", "<", ">=", "<=", "equal?"])
+
+# comparison builtin -> the test on neighbouring arguments that makes it
+# return False (see Builtin.greater and friends)
+_KERNEL_COMPARISONS = {">": "<=", "<": ">=", ">=": "<", "<=": ">", "equal?": "!="}
+
+# kernel source -> jitted kernel, so each shape of lambda is only jitted once
+_KERNELS: dict[str, Any] = {}
+
+
+class _CantEmit(Exception):
+    """
+    Raised while writing a lambda body out as Python when it uses something
+    the generated code doesn't handle.
+    """
+
+    pass
+
+
+def _numeric_kernel(paramaters, body, scopes):
+    """
+    If numba is installed and the body of a lambda only does arithmetic and
+    comparisons on its paramaters and number literals, returns (kernel, ops):
+    a jitted version of the lambda taking the paramaters as floats, and the
+    builtin names it inlined.  Otherwise returns None.
+
+    Arguments:
+        paramaters (list): the lambda's paramater names
+        body (type varies): the lambda's body, as parsed
+        scopes (tuple): the scopes enclosing the lambda, see compile_tree
+    """
+    if numba is None:
+        return None
+    if not all(isinstance(var, str) for var in paramaters):
+        return None
+    # Python names for the paramaters, the last one wins like in a call
+    args = {var: f"a{slot}" for slot, var in enumerate(paramaters)}
+    ops = set()
+    try:
+        expression, kind = _emit_numeric(body, args, scopes, ops)
+    except _CantEmit:
+        return None
+    if kind is int:
+        # nothing depends on the paramaters, not worth a kernel
+        return None
+
+    arg_names = ", ".join(f"a{slot}" for slot in range(len(paramaters)))
+    source = f"def _kernel({arg_names}):\n    return {expression}\n"
+    kernel = _KERNELS.get(source)
+    if kernel is None:
+        namespace = {}
+        try:
+            exec(source, namespace)
+        except (SyntaxError, RecursionError):
+            # nested deeper than Python's parser allows
+            return None
+        kernel = _KERNELS[source] = numba.njit(namespace["_kernel"])
+    return kernel, tuple(ops)
+
+
+def _emit_numeric(tree, args, scopes, ops):
+    """
+    Write tree as a Python expression over the paramaters in args.  Returns
+    (expression, kind), where kind is the Python type the expression gives
+    when every paramater is a float.  Raises _CantEmit when tree is
+    anything else or the kernel's result could differ from the interpreter's.
+    """
+    if isinstance(tree, float):
+        if tree != tree or tree in (float("inf"), float("-inf")):
+            raise _CantEmit
+        return repr(tree), float
+    if isinstance(tree, int):
+        return repr(tree), int
+    if isinstance(tree, str):
+        if tree in args:
+            return args[tree], float
+        raise _CantEmit
+    if len(tree) == 0 or not isinstance(tree[0], str):
+        raise _CantEmit
+
+    head = tree[0]
+    if head == "if":
+        if len(tree) != 4:
+            raise _CantEmit
+        condition, _ = _emit_numeric(tree[1], args, scopes, ops)
+        then, then_kind = _emit_numeric(tree[2], args, scopes, ops)
+        other, other_kind = _emit_numeric(tree[3], args, scopes, ops)
+        # numba would unify the branches, where Python keeps an int an int
+        if then_kind is not other_kind:
+            raise _CantEmit
+        return f"({then} if {condition} == True else {other})", then_kind
+
+    # the name has to mean the builtin, not a paramater or local
+    if head not in _KERNEL_OPS or head in args:
+        raise _CantEmit
+    if any(head in scope for scope in scopes):
+        raise _CantEmit
+    ops.add(head)
+    parts = [_emit_numeric(sub_tree, args, scopes, ops) for sub_tree in tree[1:]]
+    codes = [code for code, _ in parts]
+
+    if head in _KERNEL_COMPARISONS:
+        test = _KERNEL_COMPARISONS[head]
+        if head == "equal?":
+            if not codes:
+                raise _CantEmit
+            checks = [f"not ({codes[0]} {test} {code})" for code in codes]
+        else:
+            checks = [f"not ({a} {test} {b})" for a, b in zip(codes, codes[1:])]
+        return "(" + (" and ".join(checks) or "True") + ")", bool
+
+    # integer-only arithmetic could overflow in numba, leave it to Python
+    if float not in [kind for _, kind in parts]:
+        raise _CantEmit
+    if head == "+":
+        return "(0 + " + " + ".join(codes) + ")", float
+    if head == "-":
+        if len(codes) == 1:
+            return f"(-{codes[0]})", float
+        return f"({codes[0]} - (0 + " + " + ".join(codes[1:]) + "))", float
+    # * and / fold over their arguments from the left
+    return "(" + f" {head} ".join(codes) + ")", float
+
+
+##########################
+# Python Code Generation #
+##########################
+
+
+# generated source -> function making the Python version of a lambda, so
+# each shape of lambda is only run through exec once
+_FACTORIES: dict[str, Any] = {}
+
+
+def _python_factory(paramaters, body, scopes):
+    """
+    If the body of a lambda only uses its paramaters, names from outside of
+    every lambda and let, number literals, if, and, or and function calls,
+    returns a factory that takes the frame the lambda is evaluated in and
+    returns the body as a plain Python function of the paramaters.
+    Otherwise returns None.
+
+    Arguments:
+        paramaters (list): the lambda's paramater names
+        body (type varies): the lambda's body, as parsed
+        scopes (tuple): the scopes enclosing the lambda, see compile_tree
+    """
+    if not all(isinstance(var, str) for var in paramaters):
+        return None
+    # Python names for the paramaters, the last one wins like in a call
+    args = {var: f"a{slot}" for slot, var in enumerate(paramaters)}
+    try:
+        expression = _emit_python(body, args, scopes, tail=True)
+    except _CantEmit:
+        return None
+
+    arg_names = ", ".join(f"a{slot}" for slot in range(len(paramaters)))
+    # free names are looked up in the frame outside of every lambda and let,
+    # same as OP_GLOBAL
+    source = (
+        "def _make(_frame):\n"
+        f"    for _ in range({len(scopes)}):\n"
+        "        _frame = _frame.parent_frame\n"
+        "    _g = _frame.__getitem__\n"
+        f"    def _fast({arg_names}):\n"
+        f"        return {expression}\n"
+        "    return _fast\n"
+    )
+    factory = _FACTORIES.get(source)
+    if factory is None:
+        namespace = {"_call": _call, "_tail_call": _tail_call}
+        try:
+            exec(compile(source, "<scheme>", "exec"), namespace)
+        except (SyntaxError, RecursionError):
+            # nested deeper than Python's parser allows, leave it to execute
+            return None
+        factory = _FACTORIES[source] = namespace["_make"]
+    return factory
+
+
+def _emit_python(tree, args, scopes, tail=False):
+    """
+    Write tree as a Python expression over the paramaters in args, raising
+    _CantEmit if it uses anything _python_factory doesn't allow.  A call in
+    tail position is handed back as a _TailCall rather than made.
+    """
     if isinstance(tree, (float, int)):
-        return tree
+        if tree != tree or tree in (float("inf"), float("-inf")):
+            raise _CantEmit
+        return repr(tree)
+    if isinstance(tree, str):
+        if tree in args:
+            return args[tree]
+        # a local of an enclosing lambda or let lives in a slot
+        if any(tree in scope for scope in scopes):
+            raise _CantEmit
+        return f"_g({tree!r})"
 
-    elif isinstance(tree, str):
-        return frame[tree]
     if len(tree) == 0:
-        print("1")
-        raise SchemeEvaluationError(f"evaluate functions check")
-    elif tree[0] == "define":
-        if isinstance(tree[1], list):
-            # ['define', 'add2', ['lambda', ['x', 'y'], ['+', 'x', 'y']]]
-            # ['define', ['add2', 'x', 'y'], ['+', 'x', 'y']]
-            new_list = ["lambda"] + [tree[1][1:]]
-            new_list.append(tree[2])
-            new_tree = [tree[0], tree[1][0], new_list]
-    
-            return evaluate(new_tree, frame)
-        result = evaluate(tree[2], frame)
-        frame[tree[1]] = result
-        return result
-
-    elif tree[0] == "lambda":
-      
-        new_func = Function(frame, tree[1], tree[2])
-        return new_func
-    elif tree[0] == "if":
-      
-        if evaluate(tree[1], frame) == True:
-            return evaluate(tree[2], frame)
+        raise _CantEmit
+
+    head = tree[0]
+    if isinstance(head, str) and head in _SPECIAL:
+        if head not in ("if", "and", "or") or (head == "if" and len(tree) < 4):
+            raise _CantEmit
+        parts = [_emit_python(sub_tree, args, scopes) for sub_tree in tree[1:]]
+        if head == "if":
+            then = _emit_python(tree[2], args, scopes, tail)
+            other = _emit_python(tree[3], args, scopes, tail)
+            return f"({then} if {parts[0]} == True else {other})"
+        elif head == "and":
+            return "(True if " + (" and ".join(parts) or "True") + " else False)"
         else:
-            return evaluate(tree[3], frame)
-    elif tree[0] == "and":
-        for sub_tree in tree[1:]:
-            if not evaluate(sub_tree, frame):
-                return False
-        return True
-    elif tree[0] == "or":
-        for sub_tree in tree[1:]:
-            if evaluate(sub_tree, frame):
-                return True
-        return False
-    elif tree[0] == "del":
-        evaluate(tree[1], frame)
-        return frame.delete(tree[1])
-    elif tree[0] == "let":
-        baby_frame = Frame(frame)
-        for sub_tree in tree[1]:
-            baby_frame.bindings[sub_tree[0]] = evaluate(sub_tree[1], baby_frame)
-        return evaluate(tree[2], baby_frame)
-    elif tree[0] == "set!":
-        frame[tree[1]]
-        temp = evaluate(tree[2], frame)
-        frame.set_exisits(tree[1], temp)
-        return temp
+            return "(True if " + (" or ".join(parts) or "False") + " else False)"
 
-    else:
-        eval_tree = []
-        for element in tree:
-            eval_tree.append(evaluate(element, frame))
+    function = _emit_python(head, args, scopes)
+    parts = [_emit_python(sub_tree, args, scopes) for sub_tree in tree[1:]]
+    call = "_tail_call" if tail else "_call"
+    return f"{call}({function}, [{', '.join(parts)}])"
 
-        if not callable(eval_tree[0]):
-            print("2")
-            raise SchemeEvaluationError(f"Not callable")
 
-        return eval_tree[0](eval_tree[1:])
+def _call(function, args):
+    # a function call in generated code, see the OP_CALL case of execute
+    if not callable(function):
+        raise SchemeEvaluationError(f"Not callable: {function}")
+    return function(args)
+
+
+def _tail_call(function, args):
+    # a function call in tail position in generated code; a Function isn't
+    # called from here but returned to the loop in Function.__call__ or
+    # execute that is running this code, so the Python stack doesn't grow
+    if isinstance(function, Function):
+        return _TailCall(function, args)
+    if not callable(function):
+        raise SchemeEvaluationError(f"Not callable: {function}")
+    return function(args)
+
+
+class _TailCall:
+    """
+    A call that generated code has left for its caller to make.
+    """
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
 
 
 def result_and_frame(tree, frame=None):
@@ -257,8 +848,18 @@ def result_and_frame(tree, frame=None):
     return (evaluate(tree, frame), frame)
 
 
+# placeholder for a missing binding, since any Scheme value (even None) can
+# be bound to a name
+_MISS = object()
+
+
 class Frame:
-    def __init__(self, parent_frame=None):
+    __slots__ = ("parent_frame", "bindings")
+
+    parent_frame: Any
+    bindings: dict[str, Any]
+
+    def __init__(self, parent_frame: Optional["Frame"] = None) -> None:
         if parent_frame is None:
             self.parent_frame = Builtin()
 
@@ -267,28 +868,82 @@ class Frame:
 
         self.bindings = {}
 
-    def __getitem__(self, var):
-        if var in self.bindings:
-            return self.bindings[var]
+    def __getitem__(self, var: str) -> Any:
+        # walk up the frames ourselves rather than recursing into the parent
+        frame: Optional[Frame] = self
+        while frame is not None:
+            val = frame.bindings.get(var, _MISS)
+            if val is not _MISS:
+                return val
+            frame = frame.parent_frame
 
-        return self.parent_frame[var]
+        raise SchemeNameError(f"Cannot find {var}")
 
-    def __setitem__(self, var, val):
+    def __setitem__(self, var: str, val: Any) -> None:
         self.bindings[var] = val
 
-    def set_exisits(self, var, val):
+    def set_exisits(self, var: str, val: Any) -> None:
         if var in self.bindings:
             self.bindings[var] = val
         else:
             self.parent_frame.set_exisits(var, val)
 
-    def delete(self, val):
+    def delete(self, val: str) -> Any:
         if val not in self.bindings:
-            raise SchemeNameError
+            raise SchemeNameError(f"Cannot delete {val}, it isn't bound in this frame")
         return self.bindings.pop(val)
 
 
+class LocalFrame(Frame):
+    """
+    Frame for a function call or a let.  Its bindings live in a list of
+    slots, laid out by compile_tree, rather than in a dict; a slot holding
+    _MISS is unbound.
+    """
+
+    __slots__ = ("names", "slots")
+
+    # the defaults are only there for mypyc, whose LocalFrame.__new__ (see
+    # _new_frame) calls __init__ with no arguments
+    def __init__(self, parent_frame=None, names=None, slots=None):
+        self.parent_frame = parent_frame
+        self.names = names  # name -> slot, shared by every frame of the scope
+        self.slots = slots
+
+    def __getitem__(self, var):
+        slot = self.names.get(var)
+        if slot is not None and self.slots[slot] is not _MISS:
+            return self.slots[slot]
+
+        return self.parent_frame[var]
+
+    def __setitem__(self, var, val):
+        self.slots[self.names[var]] = val
+
+    def set_exisits(self, var, val):
+        slot = self.names.get(var)
+        if slot is not None and self.slots[slot] is not _MISS:
+            self.slots[slot] = val
+        else:
+            self.parent_frame.set_exisits(var, val)
+
+    def delete(self, val):
+        slot = self.names.get(val)
+        if slot is None or self.slots[slot] is _MISS:
+            raise SchemeNameError(f"Cannot delete {val}, it isn't bound in this frame")
+        old_val = self.slots[slot]
+        self.slots[slot] = _MISS
+        return old_val
+
+
+# the calls in execute and Function.__call__ make their frames with this and
+# set the three attributes directly, which is cheaper than LocalFrame(...)
+_new_frame = LocalFrame.__new__
+
+
 class Builtin(Frame):
+    __slots__ = ()
+
     def product(self, products):
         answer = products[0]
         for multiplier in range(1, len(products)):
@@ -334,108 +989,79 @@ class Builtin(Frame):
 
     def not_it(self, notters):
         if len(notters) != 1:
-            print("3")
-            raise SchemeEvaluationError(f"meow")
+            raise SchemeEvaluationError("not takes exactly 1 argument")
         return not notters[0]
 
     def cons(self, cons):
         if len(cons) != 2:
-            print("4")
-            raise SchemeEvaluationError(f"pair declaration")
+            raise SchemeEvaluationError("cons takes exactly 2 arguments")
         return Pair(cons[0], cons[1])
 
     def car(self, con):
         if len(con) != 1 or not isinstance(con[0], Pair):
-            print("5")
-            raise SchemeEvaluationError("car declaration")
+            raise SchemeEvaluationError("car takes exactly 1 Pair")
         return con[0].car
 
     def cdr(self, con):  # con is list of length 1, with a Pair object
         # con => [Pair object]
         #
         if len(con) != 1 or not isinstance(con[0], Pair):
-            print("6")
-            raise SchemeEvaluationError("cdr declaration")
+            raise SchemeEvaluationError("cdr takes exactly 1 Pair")
         return con[0].cdr
 
     def list(self, list_elements):
-        list_object = Nill
-        for list_element in reversed(list_elements):
-            list_object = Pair(list_element, list_object)
-        return list_object
+        return pairs_from_list(list_elements)
 
     def islist(self, listy):
         # I GOT A CLUE ON THIS ONE BIG BRO
-        if listy[0] == Nill:
+        if listy[0] is Nill:
             return True
-        if len(listy) != 1 or not isinstance(listy[0], Pair):
+        if len(listy) != 1:
             return False
-        cdr = self.cdr(listy)
-        cdr_list = [cdr]
-        if isinstance(cdr, Pair):
-            return self.islist(cdr_list)
-        elif cdr == Nill:
-            return True
-        return False
+        return is_list(listy[0])
 
     def list_length(self, listy):
         # list is the list of arguments, and the arguments is a linked list or Pair object
         # car is left side of Pair
         # cdr is right side of Pair
-        if not self.islist(listy):
-            print("7")
-            raise SchemeEvaluationError("listlength")
-        if listy[0] == Nill:
-            return 0
-        count = 1
-        while self.cdr(listy) != Nill:
+        if len(listy) != 1:
+            raise SchemeEvaluationError("length takes exactly 1 list")
+        # count and check that it's a list in the same pass
+        count = 0
+        linked_list = listy[0]
+        while isinstance(linked_list, Pair):
             count += 1
-            listy = [self.cdr([listy[0]])]
+            linked_list = linked_list.cdr
+        if linked_list is not Nill:
+            raise SchemeEvaluationError("length takes exactly 1 list")
         return count
 
     def list_indexing(self, listy):
-        if self.islist([listy[0]]):
-            # itteravely go into list'
-            if listy[1] < self.list_length([listy[0]]):
-                index = listy[1]
-                linked_list = listy[0]
-                while index != 0:
-                    linked_list = self.cdr([linked_list])
+        if is_list(listy[0]):
+            # itteravely go into list, running off the end means a bad index
+            index = listy[1]
+            linked_list = listy[0]
+            if index >= 0:
+                while linked_list is not Nill:
+                    if index == 0:
+                        return linked_list.car
+                    linked_list = linked_list.cdr
                     index -= 1
-                return self.car([linked_list])
         elif listy[1] == 0 and isinstance(listy[0], Pair):
-            pair = [listy[0]]
-            return self.car(pair)
-        print('8')
-        raise SchemeEvaluationError("indexing")
+            return listy[0].car
+        raise SchemeEvaluationError("list-ref index out of range")
 
     def copy(self, listy):
         # given a list with a list in it return a deep copy of that list
-        old_list = listy[0]
-        if old_list == Nill:
-            return Nill
-        new_list = Pair(old_list.car, self.copy([old_list.cdr]))
-        return new_list
+        return pairs_from_list(list_from_pairs(listy[0]))
 
     def map_func(self, listy):
         func = listy[0]
-        old_list = listy[1]
-        if old_list == Nill:
-            return Nill
-        new_list = Pair(
-            func([self.car([old_list])]), self.map_func([func, self.cdr([old_list])])
-        )
-        return new_list
+        return pairs_from_list([func([val]) for val in list_from_pairs(listy[1])])
 
     def filter(self, listy):
         func = listy[0]
-        old_list = listy[1]
-        if old_list == Nill:
-            return Nill
-        elif func([self.car([old_list])]):
-            return Pair(old_list.car, self.filter([func, old_list.cdr]))
-        else:
-            return self.filter([func, self.cdr([old_list])])
+        return pairs_from_list([val for val in list_from_pairs(listy[1]) if func([val])])
 
     def beign(self, listy):
         return listy[-1]
@@ -444,38 +1070,20 @@ class Builtin(Frame):
         func = listy[0]
         tree = listy[1]
         val = listy[2]
-        if tree is Nill:
-            return val
-        return self.reduce([func, tree.cdr, func([val, tree.car])])
+        for element in list_from_pairs(tree):
+            val = func([val, element])
+        return val
 
     def append(self, listy):
-        if len(listy) == 0:
-            return Nill
-        if not self.islist([listy[0]]):
-            print("9")
-            raise SchemeEvaluationError("append 1")
-        new_list = self.copy([listy[0]])
-        end_of_list=new_list
-        for additional_list in listy[1:]:
-            if new_list == Nill:
-                new_list = self.copy([additional_list])
-                continue
-            if additional_list == Nill:
-                continue
-            elif not self.islist([additional_list]):
-                print("10")
-                raise SchemeEvaluationError("append 2")
-            else:
-               
-                # get to end of list
-                while self.cdr([end_of_list]) != Nill:
-                    end_of_list = self.cdr([end_of_list])
-                # then just shove the new list at the end of list, APPENDING IT
-             
-                end_of_list.cdr = self.copy([additional_list])
-        return new_list
+        # gather every element up front, then build the new list in one go
+        elements = []
+        for additional_list in listy:
+            elements.extend(list_from_pairs(additional_list))
+        return pairs_from_list(elements)
 
     def __init__(self):
+        # the builtins are the outermost frame
+        self.parent_frame = None
         self.bindings = {
             "+": sum,
             "-": lambda args: -args[0] if len(args) == 1 else (args[0] - sum(args[1:])),
@@ -505,16 +1113,32 @@ class Builtin(Frame):
         }
 
     def __getitem__(self, name):
-        if name in self.bindings:
+        try:
             return self.bindings[name]
+        except KeyError:
+            raise SchemeNameError(f"Cannot find {name}")
+
 
-        raise SchemeNameError(f"Cannot find {name}")
+# path -> ((mtime, size), compiled contents) for the files evaluate_file has
+# read, so a file is only parsed again once it changes
+_FILE_CACHE: dict[str, tuple] = {}
 
 
 def evaluate_file(file, frame=None):
-    open_file = open(file, "r")
-    open_file = parse(tokenize(open_file.read()))
-    return evaluate(open_file, frame)
+    if frame is None:
+        frame = Frame()
+
+    path = os.path.abspath(file)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == version:
+        code = cached[1]
+    else:
+        with open(path, "r") as open_file:
+            code = compile_tree(parse(tokenize(open_file.read())))
+        _FILE_CACHE[path] = (version, code)
+    return execute(code, frame)
 
 
 class Nill:
@@ -523,23 +1147,97 @@ class Nill:
 
 
 class Function:
-    def __init__(self, frame, paramaters, code):
+    __slots__ = (
+        "frame",
+        "paramaters",
+        "arity",
+        "code",
+        "names",
+        "padding",
+        "kernel",
+        "builtins",
+        "fast",
+    )
+
+    def __init__(
+        self,
+        frame: Frame,
+        paramaters: list[str],
+        code: tuple,
+        names: dict[str, int],
+        extra_slots: int = 0,
+        kernel: Optional[tuple] = None,
+        factory: Optional[Callable] = None,
+    ) -> None:
         self.frame = frame
         self.paramaters = paramaters
+        self.arity = len(paramaters)
         self.code = code
+        # slot layout of the function's frame, see compile_tree
+        self.names = names
+        self.padding = [_MISS] * extra_slots
+        # (jitted kernel, builtin names it inlined), see _numeric_kernel
+        self.kernel = kernel
+        if kernel is not None:
+            builtins = frame
+            while builtins.parent_frame is not None:
+                builtins = builtins.parent_frame
+            self.builtins = builtins
+        # the body as a Python function, see _python_factory
+        self.fast = factory(frame) if factory is not None else None
+
+    def __call__(self, arg: list) -> Any:
+        function = self
+        # run tail calls handed back by generated code in this loop
+        while True:
+            if function.arity != len(arg):
+                function.wrong_args(arg)
+            if function.kernel is not None:
+                result = function.run_kernel(arg)
+                if result is not _MISS:
+                    return result
+            if function.fast is None:
+                # built without going through LocalFrame.__init__
+                func_frame = _new_frame(LocalFrame)
+                func_frame.parent_frame = function.frame
+                func_frame.names = function.names
+                func_frame.slots = arg + function.padding
+                return execute(function.code, func_frame)
+            result = function.fast(*arg)
+            if not isinstance(result, _TailCall):
+                return result
+            function, arg = result.function, result.args
+
+    def wrong_args(self, arg):
+        raise SchemeEvaluationError(
+            f"Wrong num params, expected {self.arity} got {len(arg)}"
+        )
 
-    def __call__(self, arg):
-        func_frame = Frame(self.frame)
-        if len(self.paramaters) != len(arg):
-            print("11")
-            raise SchemeEvaluationError(f"Wrong num params.")
-        for val, var in zip(arg, self.paramaters):
-            func_frame[var] = val
-        return evaluate(self.code, func_frame)
+    def run_kernel(self, arg):
+        """
+        Call the numeric kernel, if every argument is a float and the
+        builtins it inlined haven't been redefined since.  Returns _MISS when
+        the kernel doesn't apply.
+        """
+        for val in arg:
+            if type(val) is not float:
+                return _MISS
+        kernel, ops = self.kernel
+        for op in ops:
+            if self.frame[op] is not self.builtins.bindings[op]:
+                return _MISS
+        try:
+            return kernel(*arg)
+        except NumbaError:
+            # numba couldn't compile it after all, stick to the interpreter
+            self.kernel = None
+            return _MISS
 
 
 class Pair:
-    def __init__(self, pair1, pair2):
+    __slots__ = ("car", "cdr")
+
+    def __init__(self, pair1: Any, pair2: Any) -> None:
         self.car = pair1
         self.cdr = pair2
 
@@ -549,6 +1247,43 @@ class Pair:
         return string1
 
 
+def is_list(linked_list):
+    """
+    Returns whether a value is a Scheme list, meaning nil or a chain of Pairs
+    ending in nil.  Takes the value itself, unlike the builtin list? which
+    takes a list of arguments.
+    """
+    # follow the cdrs to whatever ends the chain
+    while isinstance(linked_list, Pair):
+        linked_list = linked_list.cdr
+    return linked_list is Nill
+
+
+def list_from_pairs(linked_list):
+    """
+    Returns the elements of a Scheme list as a Python list, so the list
+    builtins can loop over them in one contiguous array rather than chasing
+    cdrs as they go.  Raises SchemeEvaluationError if it isn't a list.
+    """
+    elements = []
+    while isinstance(linked_list, Pair):
+        elements.append(linked_list.car)
+        linked_list = linked_list.cdr
+    if linked_list is not Nill:
+        raise SchemeEvaluationError("expected a list")
+    return elements
+
+
+def pairs_from_list(elements):
+    """
+    Returns a new Scheme list holding the elements of a Python list.
+    """
+    linked_list = Nill
+    for element in reversed(elements):
+        linked_list = Pair(element, linked_list)
+    return linked_list
+
+
 def repl(verbose=False, frame=None):
     """
     Read in a single line of user input, evaluate the expression, and print 
@@ -567,13 +1302,12 @@ def repl(verbose=False, frame=None):
         if input_str == "QUIT":
             return
         try:
-            token_list = tokenize(input_str)
             if verbose:
+                token_list = tokenize(input_str)
                 print("tokens>", token_list)
-            expression = parse(token_list)
-            if verbose:
-                print("expression>", expression)
-            output, frame = result_and_frame(expression, frame)
+                print("expression>", parse(token_list))
+            # repeated inputs reuse their compiled form, see compile_source
+            output = execute(compile_source(input_str), frame)
             print("  out>", output)
         except SchemeError as e:
             if verbose:
@@ -0,0 +1,69 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled version of the tokenizer from lab.py.  lab.py imports tokenize from
+here when the extension has been built, and falls back to its own pure-Python
+version otherwise.
+
+Build in place with:
+    cythonize -i lab_fast.pyx
+"""
+
+from cpython.unicode cimport PyUnicode_AsUTF8AndSize, PyUnicode_DecodeUTF8
+
+
+def tokenize(str source):
+    """
+    Splits an input string into meaningful tokens (left parens, right parens,
+    other whitespace-separated values).  Returns a list of strings.
+
+    Arguments:
+        source (str): a string containing the source code of a Scheme
+                      expression
+    """
+    cdef Py_ssize_t n
+    cdef const char *buf
+    cdef bytes encoded
+    try:
+        buf = PyUnicode_AsUTF8AndSize(source, &n)
+    except UnicodeEncodeError:
+        # lone surrogates (e.g. from surrogateescape on stdin) have no UTF-8
+        # form, so scan a surrogatepass encoding and decode tokens the same way
+        encoded = source.encode("utf-8", "surrogatepass")
+        return _scan(encoded, len(encoded), "surrogatepass")
+    return _scan(buf, n, NULL)
+
+
+cdef list _scan(const char *buf, Py_ssize_t n, const char *errors):
+    # the delimiters are all ASCII, so scanning the UTF-8 bytes never splits
+    # a multi-byte character
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t start
+    cdef unsigned char c
+    cdef list tokens = []
+    while i < n:
+        c = buf[i]
+        if c == 59:  # ';'
+            # once we hit a semicolon keep stepping until we find a line break
+            while i < n and buf[i] != 10:
+                i += 1
+            continue
+        if c == 40:  # '('
+            tokens.append("(")
+            i += 1
+            continue
+        if c == 41:  # ')'
+            tokens.append(")")
+            i += 1
+            continue
+        if c == 32 or c == 10:
+            i += 1
+            continue
+        start = i
+        # once we hit a non parenthesis keep stepping till we hit a space
+        while i < n:
+            c = buf[i]
+            if c == 32 or c == 40 or c == 41 or c == 10:
+                break
+            i += 1
+        tokens.append(PyUnicode_DecodeUTF8(buf + start, i - start, errors))
+    return tokens